@@ -1,19 +1,85 @@
 # File: backend/api.py
 
 import math
+import contextlib
 import copy
+import functools
+import gzip
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import numba
 import numpy as np
+import orjson
 import traceback
 
 # Import Your Engine
-from simulation_core_v1_1 import run_simulation, calculate_metrics
+from simulation_core_v1_1 import run_simulation, calculate_metrics, build_plot_data, warm_up
 
 app = Flask(__name__)
 app.json.sort_keys = False  # Preserve metrics dict insertion order
 CORS(app)
 
+# Simulations run from several threads at once (see EXECUTOR). Numba's
+# fallback "workqueue" threading layer aborts on concurrent parallel
+# launches, so ask for TBB or OpenMP unless NUMBA_THREADING_LAYER already
+# picks a layer for this deployment.
+if 'NUMBA_THREADING_LAYER' not in os.environ:
+    numba.config.THREADING_LAYER = 'threadsafe'
+
+# Compile / load the Numba kernel while the worker boots rather than on
+# the first request (free-tier instances restart workers often). The first
+# parallel launch also loads the threading layer; if neither TBB nor
+# OpenMP is installed, fall back to Numba's default layer.
+try:
+    warm_up()
+except ValueError:
+    numba.config.THREADING_LAYER = 'default'
+    warm_up()
+
+# Simulations run on this pool. The Numba kernel releases the GIL, so
+# several simulations (from concurrent requests, or the perturbation runs
+# of one tornado sweep) can execute at once on a multi-core instance.
+# The pool is sized from the CPUs this process may use, not the host's
+# core count, and can be set with SIM_WORKERS.
+try:
+    _CPUS = len(os.sched_getaffinity(0))
+except AttributeError:  # not available on macOS / Windows
+    _CPUS = os.cpu_count() or 1
+SIM_WORKERS = int(os.environ.get('SIM_WORKERS', 0)) or min(_CPUS, 4)
+EXECUTOR = ThreadPoolExecutor(max_workers=SIM_WORKERS)
+
+# How concurrent simulations share the CPUs depends on the threading layer:
+#  - workqueue must not be entered by two threads at once, so simulations
+#    take turns behind a lock;
+#  - OpenMP gives every concurrent launch its own thread team, so each
+#    simulation gets its share of the CPUs (about _CPUS Numba threads for a
+#    full pool instead of SIM_WORKERS * _CPUS);
+#  - TBB runs concurrent launches on one shared worker pool, so each
+#    simulation may use all NUMBA_NUM_THREADS and an idle instance gives a
+#    single request every core.
+_THREADING_LAYER = numba.threading_layer()
+_SIMULATION_LOCK = threading.Lock() if _THREADING_LAYER == 'workqueue' else contextlib.nullcontext()
+if _THREADING_LAYER == 'omp':
+    _THREADS_PER_SIMULATION = max(1, min(_CPUS // SIM_WORKERS, numba.config.NUMBA_NUM_THREADS))
+else:
+    _THREADS_PER_SIMULATION = numba.config.NUMBA_NUM_THREADS
+
+def _run_simulation(*args, **kwargs):
+    """run_simulation() with the per-simulation Numba thread cap applied."""
+    numba.set_num_threads(_THREADS_PER_SIMULATION)
+    with _SIMULATION_LOCK:
+        return run_simulation(*args, **kwargs)
+
+
+# Standard-normal z-scores used to back lognormal mu/sigma out of the
+# percentile inputs: P10/P90 for TAM and Market Share, Q3 for Exit Multiple.
+Z_90 = 1.28155
+Z_75 = 0.6745
+_INV_TWO_Z_90 = 1.0 / (2 * Z_90)
+
 
 # =====================================================================
 # Shared parameter assembly
@@ -22,6 +88,25 @@ CORS(app)
 # JSON shape, so we factor the assembly out into one helper. It returns
 # (deal_inputs, stochastic_params, num_simulations) ready to feed into
 # run_simulation().
+#
+# Both endpoints also accept an optional integer "seed". When present,
+# the run is reproducible; when absent, every request draws fresh entropy.
+
+def _parse_seed(data):
+    """Optional RNG seed from the request body (None if not supplied).
+    Accepts a non-negative JSON integer or a string of digits only, so
+    1.5, true or "abc" are rejected instead of truncated or coerced."""
+    seed = data.get('seed')
+    if seed is None or seed == '':
+        return None
+    if isinstance(seed, str):
+        seed = seed.strip()
+        if seed.isascii() and seed.isdigit():
+            return int(seed)
+    elif isinstance(seed, int) and not isinstance(seed, bool) and seed >= 0:
+        return seed
+    raise ValueError("Seed must be a non-negative integer.")
+
 
 def _build_params(data):
     """Convert flat user-input JSON into the nested dictionaries
@@ -55,6 +140,31 @@ def _build_params(data):
     dil_mode = float(data.get('dil_mode', 0))
     dil_max = float(data.get('dil_max', 0))
     num_simulations = int(data.get('num_simulations', 100_000))
+    if num_simulations < 1:
+        raise ValueError("Number of simulations must be at least 1.")
+
+    deal_inputs, stochastic_params = _parameterize((
+        failure_rate_pct, zombie_rate_pct, rec_min, rec_mode, rec_max,
+        initial_investment, val_min, val_mode, val_max,
+        tam_min_p10, tam_max_p90, time_min, time_mode, time_max,
+        ms_min_p10_pct, ms_max_p90_pct, q1_mult, median_mult, q3_mult,
+        rounds_min, rounds_max, dil_min, dil_mode, dil_max
+    ))
+    return deal_inputs, stochastic_params, num_simulations
+
+
+# Interactive users tend to nudge one input at a time, and a tornado sweep
+# re-submits the same baseline many times, so the validation + lognormal
+# fitting is memoised on the parsed inputs. The cached dictionaries are
+# shared between calls and must be treated as read-only.
+@functools.lru_cache(maxsize=256)
+def _parameterize(inputs):
+    """Validate the parsed inputs and build (deal_inputs, stochastic_params)."""
+    (failure_rate_pct, zombie_rate_pct, rec_min, rec_mode, rec_max,
+     initial_investment, val_min, val_mode, val_max,
+     tam_min_p10, tam_max_p90, time_min, time_mode, time_max,
+     ms_min_p10_pct, ms_max_p90_pct, q1_mult, median_mult, q3_mult,
+     rounds_min, rounds_max, dil_min, dil_mode, dil_max) = inputs
 
     # --- Validation ---
     if (failure_rate_pct + zombie_rate_pct) > 100:
@@ -63,26 +173,29 @@ def _build_params(data):
         raise ValueError("Recovery on Zombie is illogical: Min <= Mode <= Max.")
     if not (val_min <= val_mode <= val_max):
         raise ValueError("Post-Money Valuation is illogical: Min <= Mode <= Max.")
+    if not (time_min <= time_mode <= time_max):
+        raise ValueError("Time to Exit is illogical: Min <= Mode <= Max.")
+    if not (rounds_min <= rounds_max):
+        raise ValueError("Number of Future Rounds is illogical: Min <= Max.")
+    if not (dil_min <= dil_mode <= dil_max):
+        raise ValueError("Dilution per Round is illogical: Min <= Mode <= Max.")
     if not (tam_min_p10 < tam_max_p90):
         raise ValueError("TAM is illogical: Min (P10) must be < Max (P90).")
     if ms_min_p10_pct <= 0 or ms_max_p90_pct <= 0:
         raise ValueError("Market Share percentiles must be strictly positive.")
 
     # --- LOGNORMAL PARAMETERIZATION ---
-    Z_90 = 1.28155
-    Z_75 = 0.6745
-
     log_p10_tam = math.log(tam_min_p10)
     log_p90_tam = math.log(tam_max_p90)
     mu_tam = (log_p90_tam + log_p10_tam) / 2
-    sigma_tam = (log_p90_tam - log_p10_tam) / (2 * Z_90)
+    sigma_tam = (log_p90_tam - log_p10_tam) * _INV_TWO_Z_90
 
     ms_min_p10 = ms_min_p10_pct / 100.0
     ms_max_p90 = ms_max_p90_pct / 100.0
     log_p10_share = math.log(ms_min_p10)
     log_p90_share = math.log(ms_max_p90)
     mu_share = (log_p90_share + log_p10_share) / 2
-    sigma_share = (log_p90_share - log_p10_share) / (2 * Z_90)
+    sigma_share = (log_p90_share - log_p10_share) * _INV_TWO_Z_90
 
     mu_mult = math.log(median_mult)
     if q3_mult <= median_mult or q1_mult <= 0:
@@ -122,7 +235,7 @@ def _build_params(data):
         'exit_multiple_inputs': {'q1': q1_mult, 'median': median_mult, 'q3': q3_mult}
     }
 
-    return deal_inputs, stochastic_params, num_simulations
+    return deal_inputs, stochastic_params
 
 
 def _asymmetry_score(metrics):
@@ -138,6 +251,19 @@ def _asymmetry_score(metrics):
     return f
 
 
+def _json_response(payload):
+    """Wrap an already-encoded JSON body in a response, gzipping it when
+    the client advertises gzip support. Numeric JSON compresses several
+    times over, which matters on the slow hop from the free-tier backend
+    to the static frontend."""
+    response = app.response_class(payload, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if request.accept_encodings['gzip']:
+        response.set_data(gzip.compress(payload, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
 # =====================================================================
 # Main simulation endpoint
 # =====================================================================
@@ -151,26 +277,35 @@ def handle_simulation():
 
         try:
             deal_inputs, stochastic_params, num_simulations = _build_params(data)
+            seed = _parse_seed(data)
         except ValueError as ve:
             return jsonify({"error": str(ve)}), 400
 
-        simulation_results = run_simulation(
+        future = EXECUTOR.submit(
+            _run_simulation,
             deal_inputs,
             stochastic_params,
-            num_simulations=num_simulations
+            num_simulations=num_simulations,
+            seed=seed,
+            return_all=True  # the metrics panel shows the success-path diagnostics
         )
+        simulation_results = future.result()
         summary_metrics = calculate_metrics(simulation_results, deal_inputs)
-
-        plot_data_irr = simulation_results['IRR'].tolist()
-        plot_data_moic = simulation_results['MOIC'].tolist()
-        plot_data_path = simulation_results['Path'].astype(int).tolist()
-
-        return jsonify({
-            "metrics": summary_metrics,
-            "plot_data_irr": plot_data_irr,
-            "plot_data_moic": plot_data_moic,
-            "plot_data_path": plot_data_path
-        })
+        plot_data = build_plot_data(simulation_results)
+
+        # orjson writes the ndarrays straight from their buffers instead of
+        # boxing Python floats for the stdlib encoder. Non-finite
+        # metrics (e.g. an infinite asymmetry score) are emitted as null.
+        payload = orjson.dumps(
+            {
+                "metrics": summary_metrics,
+                "plot_data_irr": plot_data['irr_hist'],
+                "plot_data_moic": plot_data['moic_hist'],
+                "plot_data_ccdf": plot_data['moic_ccdf']
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY
+        )
+        return _json_response(payload)
 
     except Exception as e:
         traceback.print_exc()
@@ -210,7 +345,9 @@ def _safe_run_score(data_payload):
     gets skipped instead of the whole tornado failing)."""
     try:
         deal_inputs, stochastic_params, num_simulations = _build_params(data_payload)
-        sim = run_simulation(deal_inputs, stochastic_params, num_simulations=num_simulations)
+        sim = _run_simulation(deal_inputs, stochastic_params,
+                              num_simulations=num_simulations,
+                              seed=_parse_seed(data_payload))
         metrics = calculate_metrics(sim, deal_inputs)
         return _asymmetry_score(metrics)
     except Exception:
@@ -233,11 +370,10 @@ def handle_sensitivity():
         rel_perturb = float(data.get('relative_perturb_pct', 20)) / 100.0   # ±20% by default
         abs_perturb_pp = float(data.get('absolute_perturb_pp', 10))         # ±10pp by default
 
-        baseline_score = _safe_run_score(baseline)
-        if baseline_score is None:
-            return jsonify({"error": "Baseline simulation failed; check your inputs."}), 400
-
-        results = []
+        # Every run in the sweep is independent, so all of them are
+        # submitted to the pool up front and collected afterwards.
+        baseline_future = EXECUTOR.submit(_safe_run_score, baseline)
+        pending = []
 
         # --- Relative groups (multiplicative ±X%) ---
         for label, fields in _SENSITIVITY_GROUPS_RELATIVE:
@@ -247,14 +383,9 @@ def handle_sensitivity():
                 base_v = float(up.get(f, 0))
                 up[f]   = base_v * (1.0 + rel_perturb)
                 down[f] = base_v * (1.0 - rel_perturb)
-            up_score = _safe_run_score(up)
-            down_score = _safe_run_score(down)
-            results.append({
-                'name': label,
-                'up_score':   up_score   if up_score   is not None else baseline_score,
-                'down_score': down_score if down_score is not None else baseline_score,
-                'shift_label': f'±{int(rel_perturb * 100)}%'
-            })
+            pending.append((label, f'±{int(rel_perturb * 100)}%',
+                            EXECUTOR.submit(_safe_run_score, up),
+                            EXECUTOR.submit(_safe_run_score, down)))
 
         # --- Absolute percentage-point groups ---
         for label, fields in _SENSITIVITY_GROUPS_ABSOLUTE_PCT:
@@ -264,13 +395,26 @@ def handle_sensitivity():
                 base_v = float(up.get(f, 0))
                 up[f]   = max(0.0, min(95.0, base_v + abs_perturb_pp))
                 down[f] = max(0.0, min(95.0, base_v - abs_perturb_pp))
-            up_score = _safe_run_score(up)
-            down_score = _safe_run_score(down)
+            pending.append((label, f'±{int(abs_perturb_pp)}pp',
+                            EXECUTOR.submit(_safe_run_score, up),
+                            EXECUTOR.submit(_safe_run_score, down)))
+
+        baseline_score = baseline_future.result()
+        if baseline_score is None:
+            for _, _, up_future, down_future in pending:
+                up_future.cancel()
+                down_future.cancel()
+            return jsonify({"error": "Baseline simulation failed; check your inputs."}), 400
+
+        results = []
+        for label, shift_label, up_future, down_future in pending:
+            up_score = up_future.result()
+            down_score = down_future.result()
             results.append({
                 'name': label,
                 'up_score':   up_score   if up_score   is not None else baseline_score,
                 'down_score': down_score if down_score is not None else baseline_score,
-                'shift_label': f'±{int(abs_perturb_pp)}pp'
+                'shift_label': shift_label
             })
 
         return jsonify({
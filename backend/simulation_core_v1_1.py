@@ -5,14 +5,175 @@
 # It only takes data, crunches numbers, and returns data.
 
 import numpy as np
-import pandas as pd
-import scipy.stats as stats
+from numpy.random import default_rng
+from numba import njit, prange
+import bisect
 import math
 
 
 # --- SIMULATION CORE (TRIMODAL) ---
 
-def run_simulation(deal_inputs, stochastic_params, num_simulations=100_000):
+# Simulations per RNG stream in the parallel kernel. Each chunk reseeds
+# Numba's per-thread generator before drawing, so the output depends only
+# on the chunk seeds and not on how prange schedules chunks onto threads.
+_CHUNK_SIZE = 4096
+
+# Per-run outputs are stored as float32: the metrics and histograms do not
+# need float64 precision, and the arrays are half the size to write and
+# re-read. Arithmetic inside the kernel stays float64 in registers.
+_RESULT_DTYPE = np.float32
+_RESULT_MAX = float(np.finfo(_RESULT_DTYPE).max)
+
+
+@njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def _simulate_kernel(chunk_seeds, num_simulations, initial_investment,
+                     failure_rate, success_rate_threshold,
+                     rec_min, rec_mode, rec_max,
+                     val_min, val_mode, val_max,
+                     time_min, time_mode, time_max,
+                     tam_mu, tam_sigma, ms_mu, ms_sigma, mult_mu, mult_sigma,
+                     rounds_min, rounds_max,
+                     dil_min, dil_mode, dil_max,
+                     store_diagnostics):
+    """
+    Fused sampling + MOIC/IRR loop. One iteration is one simulated deal;
+    every intermediate lives in registers and only the per-run outputs
+    are written back to memory. The success-path intermediates
+    (ExitValuation, TAM, ...) are only sampled for Path 2 runs and are 0
+    for the other paths. Unless store_diagnostics is set, the six
+    diagnostic arrays (ExitMultiple .. CumulativeDilution) come back
+    empty and are never written.
+    """
+    irr = np.empty(num_simulations, dtype=_RESULT_DTYPE)
+    moic = np.empty(num_simulations, dtype=_RESULT_DTYPE)
+    path_label = np.empty(num_simulations, dtype=np.int8)
+    holding_periods = np.empty(num_simulations, dtype=_RESULT_DTYPE)
+    exit_valuations = np.empty(num_simulations, dtype=_RESULT_DTYPE)
+
+    num_diagnostics = num_simulations if store_diagnostics else 0
+    exit_multiples = np.empty(num_diagnostics, dtype=_RESULT_DTYPE)
+    market_shares = np.empty(num_diagnostics, dtype=_RESULT_DTYPE)
+    tam_samples = np.empty(num_diagnostics, dtype=_RESULT_DTYPE)
+    post_money_valuations = np.empty(num_diagnostics, dtype=_RESULT_DTYPE)
+    final_ownership = np.empty(num_diagnostics, dtype=_RESULT_DTYPE)
+    cumulative_dilution = np.empty(num_diagnostics, dtype=_RESULT_DTYPE)
+
+    for chunk in prange(chunk_seeds.shape[0]):
+        np.random.seed(chunk_seeds[chunk])
+        start = chunk * _CHUNK_SIZE
+        stop = min(start + _CHUNK_SIZE, num_simulations)
+
+        for i in range(start, stop):
+            # "Master die roll" and the holding period (reported for every path)
+            path_switch = np.random.random()
+            holding = max(np.random.triangular(time_min, time_mode, time_max), 0.01)
+
+            # Success-path intermediates stay 0 unless that path is taken
+            post_money = 0.0
+            tam = 0.0
+            market_share = 0.0
+            exit_multiple = 0.0
+            dilution_factor = 0.0
+            ownership = 0.0
+            exit_valuation = 0.0
+
+            # Combine all 3 paths (0 = Failure, 1 = Zombie, 2 = Success).
+            # Each path only draws the variates it actually uses.
+            if path_switch < failure_rate:
+                run_moic = 0.0
+                path_label[i] = 0
+            elif path_switch < success_rate_threshold:
+                run_moic = np.random.triangular(rec_min, rec_mode, rec_max)
+                path_label[i] = 1
+            else:
+                post_money = np.random.triangular(val_min, val_mode, val_max)
+                tam = np.random.lognormal(tam_mu, tam_sigma)
+                market_share = np.random.lognormal(ms_mu, ms_sigma)
+                exit_multiple = np.random.lognormal(mult_mu, mult_sigma)
+                num_rounds = np.random.randint(rounds_min, rounds_max + 1)
+                dilution = np.random.triangular(dil_min, dil_mode, dil_max)
+
+                dilution_factor = (1.0 - dilution) ** num_rounds
+                initial_ownership = initial_investment / post_money if post_money > 0 else 0.0
+                ownership = initial_ownership * dilution_factor
+                exit_valuation = tam * market_share * exit_multiple
+                if initial_investment > 0:
+                    run_moic = exit_valuation * ownership / initial_investment
+                else:
+                    run_moic = 0.0
+                path_label[i] = 2
+
+            # Only runs with a positive MOIC pay for the pow; failures (and
+            # any zero-MOIC zombie/success run) are pinned at -100%. The
+            # holding period is floored at 0.01 above, so it needs no check.
+            if run_moic > 0:
+                # Clip so a huge MOIC over a very short hold cannot
+                # overflow the float32 store to inf
+                irr[i] = min(math.pow(run_moic, 1.0 / holding) - 1.0, _RESULT_MAX)
+            else:
+                irr[i] = -1.0  # IRR is -100% for all 0.0 MOIC runs
+
+            moic[i] = run_moic
+            holding_periods[i] = holding
+            exit_valuations[i] = exit_valuation
+            if store_diagnostics:
+                exit_multiples[i] = exit_multiple
+                market_shares[i] = market_share
+                tam_samples[i] = tam
+                post_money_valuations[i] = post_money
+                final_ownership[i] = ownership
+                cumulative_dilution[i] = dilution_factor
+
+    return (irr, moic, path_label, holding_periods, exit_valuations,
+            exit_multiples, market_shares, tam_samples,
+            post_money_valuations, final_ownership, cumulative_dilution)
+
+
+def _triangular_args(params, name):
+    """(min, mode, max) of a Triangular parameter dict, as kernel floats.
+    The kernel's sampler does not check its arguments, so bounds that are
+    out of order are rejected here."""
+    low, mode, high = float(params['min']), float(params['mode']), float(params['max'])
+    if not (low <= mode <= high):
+        raise ValueError(f"{name}: Triangular requires min <= mode <= max "
+                         f"(got {low}, {mode}, {high}).")
+    return low, mode, high
+
+
+def _lognormal_args(params):
+    """(mu, sigma) of a Lognormal parameter dict, as kernel floats."""
+    return float(params['mu']), float(params['sigma'])
+
+
+_WARMED = False
+
+
+def warm_up():
+    """
+    Compiles (or loads from the on-disk Numba cache) _simulate_kernel by
+    running it once on a tiny dummy deal, so the first real request does
+    not pay the JIT cost. Safe to call repeatedly; only the first call
+    does any work. The argument types match what run_simulation passes.
+    """
+    global _WARMED
+    if _WARMED:
+        return
+    _simulate_kernel(
+        np.zeros(1, dtype=np.uint32), 1000, 1.0,
+        0.5, 0.75,
+        0.1, 0.3, 0.9,
+        10.0, 15.0, 20.0,
+        4.0, 6.0, 9.0,
+        0.0, 1.0, 0.0, 1.0, 0.0, 1.0,
+        2, 4,
+        0.15, 0.2, 0.25,
+        True
+    )
+    _WARMED = True
+
+
+def run_simulation(deal_inputs, stochastic_params, num_simulations=100_000, seed=None,
+                   return_all=False):
     """
     Runs the Monte Carlo simulation for venture capital returns.
 
@@ -21,6 +182,17 @@ def run_simulation(deal_inputs, stochastic_params, num_simulations=100_000):
     1. Total Loss (Failure): MOIC = 0.0
     2. Low Recovery (Zombie): MOIC = Triangular(0.1, 0.3, 0.9)
     3. Success (Power-Law): MOIC = Full Lognormal diligence model
+
+    The per-run sampling and MOIC/IRR math happen in _simulate_kernel;
+    this function only unpacks the parameter dictionaries and labels
+    the results. Passing the same `seed` reproduces the same runs;
+    seed=None draws fresh entropy on every call.
+
+    The returned dict always holds IRR, MOIC, Path, HoldingPeriod and
+    ExitValuation, which is all calculate_metrics needs for the headline
+    metrics. Pass return_all=True to also get the success-path
+    diagnostics (ExitMultiple, MarketShare, TAM, PostMoneyValuation,
+    FinalOwnership, CumulativeDilution).
     """
 
     # --- 1. Static Calculations ---
@@ -33,168 +205,156 @@ def run_simulation(deal_inputs, stochastic_params, num_simulations=100_000):
     # Success rate is the remainder
     success_rate_threshold = failure_rate + zombie_rate  # e.g., 0.50 + 0.25 = 0.75
 
-    # Generate the "master die roll" that decides the path
-    path_switch = stats.uniform(loc=0, scale=1).rvs(num_simulations)
-
-    # --- 3. Generate "Path 2: Zombie" Returns (Vectorized) ---
-    rec_params = stochastic_params['recovery_on_zombie']
-    rec_loc = rec_params['min']
-    rec_scale = rec_params['max'] - rec_params['min']
-    rec_c = (rec_params['mode'] - rec_params['min']) / rec_scale if rec_scale > 0 else 0.5
-    moic_zombie_path = stats.triang(c=rec_c, loc=rec_loc, scale=rec_scale).rvs(num_simulations)
-
-    # --- 4. Generate "Path 3: Success" Returns (Vectorized) ---
-    # This is the entire Lognormal model (same as before)
-
-    # Post-Money Valuation (Triangular)
-    val_params = stochastic_params['post_money_val_cap']
-    val_loc = val_params['min']
-    val_scale = val_params['max'] - val_params['min']
-    val_c = (val_params['mode'] - val_params['min']) / val_scale if val_scale > 0 else 0.5
-    post_money_valuations = stats.triang(c=val_c, loc=val_loc, scale=val_scale).rvs(num_simulations)
-
-    # Time to Exit (Triangular)
-    time_params = stochastic_params['time_to_exit_yrs']
-    time_loc = time_params['min']
-    time_scale = time_params['max'] - time_params['min']
-    time_c = (time_params['mode'] - time_params['min']) / time_scale if time_scale > 0 else 0.5
-    holding_periods = stats.triang(c=time_c, loc=time_loc, scale=time_scale).rvs(num_simulations)
-    holding_periods = np.maximum(holding_periods, 0.01)  # Avoid divide by zero
-
-    # TAM (Lognormal)
-    tam_params = stochastic_params['tam_lognormal']
-    tam_samples = stats.lognorm(
-        s=tam_params['sigma'],
-        scale=math.exp(tam_params['mu'])
-    ).rvs(num_simulations)
-
-    # Market Share (Lognormal)
-    ms_params = stochastic_params['market_share_lognormal']
-    market_shares = stats.lognorm(
-        s=ms_params['sigma'],
-        scale=math.exp(ms_params['mu'])
-    ).rvs(num_simulations)
-
-    # Exit Multiple (Lognormal)
-    mult_params = stochastic_params['exit_multiple_lognormal']
-    exit_multiples = stats.lognorm(
-        s=mult_params['sigma'],
-        scale=math.exp(mult_params['mu'])
-    ).rvs(num_simulations)
-
-    # Dilution (Triangular/Discrete)
-    round_params = stochastic_params['num_future_rounds']
-    sampled_num_rounds = stats.randint(
-        low=round_params['min'],
-        high=round_params['max'] + 1
-    ).rvs(num_simulations)
-
-    dil_params = stochastic_params['dilution_per_round']
-    dil_loc = dil_params['min']
-    dil_scale = dil_params['max'] - dil_params['min']
-    dil_c = (dil_params['mode'] - dil_params['min']) / dil_scale if dil_scale > 0 else 0.5
-    sampled_dilution_per_round = stats.triang(
-        c=dil_c, loc=dil_loc, scale=dil_scale
-    ).rvs(num_simulations)
-
-    cumulative_dilution_factor = (1 - sampled_dilution_per_round) ** sampled_num_rounds
-
-    # --- 5. Calculate "Path 3: Success" MOIC ---
-    initial_ownership_pct = np.where(
-        post_money_valuations > 0,
-        initial_investment / post_money_valuations,
-        0
-    )
-    final_ownership_pct = initial_ownership_pct * cumulative_dilution_factor
-    exit_revenue = tam_samples * market_shares
-    exit_valuation = exit_revenue * exit_multiples
-    exit_proceeds = exit_valuation * final_ownership_pct
-
-    moic_success_path = np.where(initial_investment > 0, exit_proceeds / initial_investment, 0)
-
-    # --- 6. Combine All 3 Paths ---
-    moic = np.where(
-        path_switch < failure_rate,
-        0.0,  # Path 1: Total Loss
-        np.where(
-            path_switch < success_rate_threshold,
-            moic_zombie_path,  # Path 2: Zombie
-            moic_success_path  # Path 3: Success
-        )
-    )
-
-    # Calculate final IRR based on the *actual* (trimodal) MOIC
-    irr = np.where(
-        (moic > 0) & (holding_periods > 0),
-        (moic ** (1 / holding_periods)) - 1,
-        -1.0  # IRR is -100% for all 0.0 MOIC runs
-    )
-
-    # --- 7. Record Path Labels ---
-    # 0 = Failure, 1 = Zombie, 2 = Success
-    path_label = np.where(
-        path_switch < failure_rate,
-        0,
-        np.where(path_switch < success_rate_threshold, 1, 2)
+    # --- 3. Path Distributions ---
+    rec_params = stochastic_params['recovery_on_zombie']       # Triangular
+    val_params = stochastic_params['post_money_val_cap']       # Triangular
+    time_params = stochastic_params['time_to_exit_yrs']        # Triangular
+    tam_params = stochastic_params['tam_lognormal']            # Lognormal
+    ms_params = stochastic_params['market_share_lognormal']    # Lognormal
+    mult_params = stochastic_params['exit_multiple_lognormal']  # Lognormal
+    round_params = stochastic_params['num_future_rounds']      # Discrete uniform
+    dil_params = stochastic_params['dilution_per_round']       # Triangular
+
+    rounds_min, rounds_max = int(round_params['min']), int(round_params['max'])
+    if rounds_min > rounds_max:
+        raise ValueError(f"num_future_rounds: requires min <= max "
+                         f"(got {rounds_min}, {rounds_max}).")
+
+    # --- 4. Seed One RNG Stream Per Kernel Chunk ---
+    # A fresh PCG64 per call (not a shared module-level one) keeps
+    # concurrent requests from contending for, or correlating through,
+    # the same generator state.
+    rng = default_rng(seed)
+    num_chunks = -(-num_simulations // _CHUNK_SIZE)
+    chunk_seeds = rng.integers(0, 2**32, size=num_chunks, dtype=np.uint32)
+
+    # --- 5. Run the Fused Kernel ---
+    (irr, moic, path_label, holding_periods, exit_valuation,
+     exit_multiples, market_shares, tam_samples, post_money_valuations,
+     final_ownership_pct, cumulative_dilution_factor) = _simulate_kernel(
+        chunk_seeds, num_simulations, float(initial_investment),
+        float(failure_rate), float(success_rate_threshold),
+        *_triangular_args(rec_params, 'recovery_on_zombie'),
+        *_triangular_args(val_params, 'post_money_val_cap'),
+        *_triangular_args(time_params, 'time_to_exit_yrs'),
+        *_lognormal_args(tam_params),
+        *_lognormal_args(ms_params),
+        *_lognormal_args(mult_params),
+        rounds_min, rounds_max,
+        *_triangular_args(dil_params, 'dilution_per_round'),
+        bool(return_all)
     )
 
-    # --- 8. Store Results ---
-    results_df = pd.DataFrame({
+    # --- 6. Store Results ---
+    results = {
         'IRR': irr,
         'MOIC': moic,
         'Path': path_label,
         'HoldingPeriod': holding_periods,
-        'ExitValuation': exit_valuation,
-        'ExitMultiple': exit_multiples,
-        'MarketShare': market_shares,
-        'TAM': tam_samples,
-        'PostMoneyValuation': post_money_valuations,
-        'FinalOwnership': final_ownership_pct,
-        'CumulativeDilution': cumulative_dilution_factor
-    })
-
-    return results_df
+        'ExitValuation': exit_valuation
+    }
+    if return_all:
+        results.update({
+            'ExitMultiple': exit_multiples,
+            'MarketShare': market_shares,
+            'TAM': tam_samples,
+            'PostMoneyValuation': post_money_valuations,
+            'FinalOwnership': final_ownership_pct,
+            'CumulativeDilution': cumulative_dilution_factor
+        })
+
+    return results
+
+
+# --- RECOMMENDATION BANDS ---
+
+# Asymmetry-score cutoffs and the recommendation for each band. A score
+# must be strictly above a cutoff to reach the next band, hence
+# bisect_left: scores <= 1 -> [0], (1, 3] -> [1], (3, 10] -> [2], > 10 -> [3].
+_RECOMMENDATION_THRESHOLDS = (1.0, 3.0, 10.0)
+_RECOMMENDATIONS = (
+    "Not Recommended (Unfavorable Asymmetry)",
+    "Proceed with Caution (Marginally Favorable)",
+    "Recommend (Favorable Asymmetry)",
+    "Strongly Recommend (Exceptional Asymmetry)",
+)
+
+
+def _sorted_quantiles(sorted_values, qs):
+    """
+    Quantiles of an already-sorted 1-D array, using the same linear
+    interpolation as np.quantile's default method. O(1) per quantile.
+    """
+    positions = np.asarray(qs) * (sorted_values.size - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, sorted_values.size - 1)
+    lower_values = sorted_values[lower].astype(np.float64)
+    return lower_values + (positions - lower) * (sorted_values[upper] - lower_values)
 
 
-def calculate_metrics(results_df, deal_inputs):
+def calculate_metrics(results, deal_inputs):
     """
     Calculates all required summary statistics and asymmetry metrics.
     (*** MODIFIED to include more granular metrics ***)
+
+    `results` is the dict of per-run arrays returned by run_simulation.
+    Those arrays are float32, so means are accumulated in float64. The
+    success-path diagnostic medians are only reported when run_simulation
+    was called with return_all=True.
     """
+    moic = results['MOIC']
+    holding_periods = results['HoldingPeriod']
+    initial_investment = deal_inputs['initial_investment']
+
+    # IRR and MOIC are sorted once; every percentile, tail mean and
+    # probability below is then an index lookup, a slice or a
+    # searchsorted instead of another pass over the data.
+    irr_sorted = np.sort(results['IRR'])
+    moic_sorted = np.sort(moic)
+    n = irr_sorted.size
 
     # --- IRR Metrics ---
-    expected_irr = results_df['IRR'].mean()
-    median_irr = results_df['IRR'].median()
-    irr_p05 = results_df['IRR'].quantile(0.05)
-    irr_p10 = results_df['IRR'].quantile(0.10)
-    irr_p25 = results_df['IRR'].quantile(0.25)
-    irr_p75 = results_df['IRR'].quantile(0.75)
-    irr_p90 = results_df['IRR'].quantile(0.90)
-    irr_p95 = results_df['IRR'].quantile(0.95)
+    expected_irr = np.mean(irr_sorted, dtype=np.float64)
+    irr_p05, irr_p10, irr_p25, median_irr, irr_p75, irr_p90, irr_p95 = _sorted_quantiles(
+        irr_sorted, [0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95]
+    )
 
     # --- MOIC Metrics ---
-    expected_moic = results_df['MOIC'].mean()
-    median_moic = results_df['MOIC'].median()
-    moic_p10 = results_df['MOIC'].quantile(0.10)
-    moic_p25 = results_df['MOIC'].quantile(0.25)
-    moic_p75 = results_df['MOIC'].quantile(0.75)
-    moic_p90 = results_df['MOIC'].quantile(0.90)
+    expected_moic = np.mean(moic_sorted, dtype=np.float64)
+    moic_p10, moic_p25, median_moic, moic_p75, moic_p90 = _sorted_quantiles(
+        moic_sorted, [0.10, 0.25, 0.50, 0.75, 0.90]
+    )
 
     # --- Probability Metrics ---
-    p_moic_lt_0_1 = (results_df['MOIC'] < 0.1).mean()
-    p_moic_gte_3 = (results_df['MOIC'] >= 3).mean()
-    p_moic_gte_10 = (results_df['MOIC'] >= 10).mean()
+    p_moic_lt_0_1 = np.searchsorted(moic_sorted, 0.1) / n
+    p_moic_gte_3 = (n - np.searchsorted(moic_sorted, 3)) / n
+    p_moic_gte_10 = (n - np.searchsorted(moic_sorted, 10)) / n
 
     # --- Valuation & Proceeds Metrics ---
     # ExitValuation is only meaningful for the Success path (Path == 2)
-    success_mask = results_df['Path'] == 2
-    success_df = results_df[success_mask]
-
-    if not success_df.empty:
-        mean_exit_valuation = success_df['ExitValuation'].mean()
-        p25_exit_valuation = success_df['ExitValuation'].quantile(0.25)
-        median_exit_valuation = success_df['ExitValuation'].median()
-        p75_exit_valuation = success_df['ExitValuation'].quantile(0.75)
+    success_mask = results['Path'] == 2
+    success_count = np.count_nonzero(success_mask)
+
+    def success_median(column):
+        return np.median(results[column][success_mask]) if success_count else 0
+
+    diagnostic_metrics = {}
+    if 'FinalOwnership' in results:
+        diagnostic_metrics = {
+            "Median Final Ownership (Success)": success_median('FinalOwnership'),
+            "Median Cumulative Dilution (Success)": success_median('CumulativeDilution'),
+            "Median Post-Money Val (Success)": success_median('PostMoneyValuation'),
+            "Median TAM (Success)": success_median('TAM'),
+            "Median Market Share (Success)": success_median('MarketShare'),
+            "Median Exit Multiple (Success)": success_median('ExitMultiple'),
+        }
+
+    if success_count:
+        success_exit_valuation = results['ExitValuation'][success_mask]
+        mean_exit_valuation = np.mean(success_exit_valuation, dtype=np.float64)
+        p25_exit_valuation, median_exit_valuation, p75_exit_valuation = np.quantile(
+            success_exit_valuation, [0.25, 0.50, 0.75]
+        )
     else:
         mean_exit_valuation = 0.0
         p25_exit_valuation = 0.0
@@ -202,35 +362,40 @@ def calculate_metrics(results_df, deal_inputs):
         p75_exit_valuation = 0.0
 
     # Blended (all-path) investor proceeds — the true portfolio expected value
-    mean_investor_proceeds = results_df['MOIC'].mean() * deal_inputs['initial_investment']
-    median_investor_proceeds = results_df['MOIC'].median() * deal_inputs['initial_investment']
+    mean_investor_proceeds = expected_moic * initial_investment
+    median_investor_proceeds = median_moic * initial_investment
 
     # Success-conditional investor proceeds — what you get IF the deal succeeds
-    if not success_df.empty:
-        mean_success_proceeds = success_df['MOIC'].mean() * deal_inputs['initial_investment']
-        median_success_proceeds = success_df['MOIC'].median() * deal_inputs['initial_investment']
+    if success_count:
+        success_moic = moic[success_mask]
+        mean_success_proceeds = np.mean(success_moic, dtype=np.float64) * initial_investment
+        median_success_proceeds = np.median(success_moic) * initial_investment
     else:
         mean_success_proceeds = 0.0
         median_success_proceeds = 0.0
 
     # --- Holding Period Metrics ---
-    mean_holding_period = results_df['HoldingPeriod'].mean()
-    p25_holding_period = results_df['HoldingPeriod'].quantile(0.25)
-    median_holding_period = results_df['HoldingPeriod'].median()
-    p75_holding_period = results_df['HoldingPeriod'].quantile(0.75)
+    mean_holding_period = np.mean(holding_periods, dtype=np.float64)
+    p25_holding_period, median_holding_period, p75_holding_period = np.quantile(
+        holding_periods, [0.25, 0.50, 0.75]
+    )
 
     # --- Asymmetry Score (AS) ---
-    irr_p90_threshold = results_df['IRR'].quantile(0.90)
+    # Both tails are contiguous slices (views) of the sorted IRR array.
+    # The threshold is cast to the array dtype so searchsorted does not
+    # upcast (copy) the whole array.
+    irr_p90_threshold = irr_sorted.dtype.type(irr_p90)
 
-    top_10_percent_runs = results_df[results_df['IRR'] >= irr_p90_threshold]
+    top_10_percent_start = np.searchsorted(irr_sorted, irr_p90_threshold)
     conditional_upside_e_plus = 0.0
-    if not top_10_percent_runs.empty:
-        conditional_upside_e_plus = top_10_percent_runs['IRR'].mean()
+    if top_10_percent_start < n:
+        conditional_upside_e_plus = np.mean(irr_sorted[top_10_percent_start:], dtype=np.float64)
 
-    losing_runs = results_df[results_df['IRR'] < 0]
+    losing_end = np.searchsorted(irr_sorted, 0.0)
+    has_losing_runs = losing_end > 0
     conditional_downside_e_minus = 0.0
-    if not losing_runs.empty:
-        conditional_downside_e_minus = losing_runs['IRR'].mean()
+    if has_losing_runs:
+        conditional_downside_e_minus = np.mean(irr_sorted[:losing_end], dtype=np.float64)
 
     asymmetry_score = 0.0
     if conditional_downside_e_minus != 0:
@@ -240,22 +405,15 @@ def calculate_metrics(results_df, deal_inputs):
             asymmetry_score = conditional_upside_e_plus / abs(conditional_downside_e_minus)
 
     # --- Recommendation ---
-    recommendation = "N/A"
-    if losing_runs.empty:
+    if not has_losing_runs:
         if conditional_upside_e_plus > 0:
             recommendation = "Strongly Recommend (No Downside Registered)"
         else:
             recommendation = "N/A (No Upside or Downside Registered)"
-    elif asymmetry_score > 10:
-        recommendation = "Strongly Recommend (Exceptional Asymmetry)"
-    elif asymmetry_score > 3:
-        recommendation = "Recommend (Favorable Asymmetry)"
-    elif asymmetry_score > 1:
-        recommendation = "Proceed with Caution (Marginally Favorable)"
-    elif asymmetry_score >= 0:
-        recommendation = "Not Recommended (Unfavorable Asymmetry)"
     else:
-        recommendation = "Not Recommended (Unfavorable Asymmetry)"
+        recommendation = _RECOMMENDATIONS[
+            bisect.bisect_left(_RECOMMENDATION_THRESHOLDS, asymmetry_score)
+        ]
 
     # --- Assemble Final Dictionary ---
     metrics = {
@@ -301,13 +459,8 @@ def calculate_metrics(results_df, deal_inputs):
         "Median Proceeds (Success Only)": median_success_proceeds,
 
         "--- Diagnostic (Success Path Intermediates) ---": "",
-        "Median Final Ownership (Success)": success_df['FinalOwnership'].median() if not success_df.empty else 0,
-        "Median Cumulative Dilution (Success)": success_df['CumulativeDilution'].median() if not success_df.empty else 0,
-        "Median Post-Money Val (Success)": success_df['PostMoneyValuation'].median() if not success_df.empty else 0,
-        "Median TAM (Success)": success_df['TAM'].median() if not success_df.empty else 0,
-        "Median Market Share (Success)": success_df['MarketShare'].median() if not success_df.empty else 0,
-        "Median Exit Multiple (Success)": success_df['ExitMultiple'].median() if not success_df.empty else 0,
-        "Success Path Count": float(len(success_df)),
+        **diagnostic_metrics,
+        "Success Path Count": float(success_count),
 
         "--- Holding Period ---": "",
         "Mean Holding Period": mean_holding_period,
@@ -324,4 +477,63 @@ def calculate_metrics(results_df, deal_inputs):
         "Recommendation": recommendation
     }
 
-    return metrics
\ No newline at end of file
+    return metrics
+
+
+# --- PLOT DATA (SERVER-SIDE BINNING) ---
+
+# The charts cannot resolve more than a few hundred bins, so only binned
+# counts and a thinned CCDF go over the wire instead of all N runs.
+_IRR_HIST_BINS = 200
+_MOIC_LOG10_EDGES = np.linspace(-2.0, 4.0, 81)  # 0.01x .. 10,000x in 0.075 steps
+_CCDF_POINTS = 600
+
+
+def build_plot_data(results):
+    """
+    Reduces the per-run arrays from run_simulation to what the frontend
+    charts draw:
+    - irr_hist:  IRR histogram counts + bin edges
+    - moic_hist: log10(MOIC) histogram per path on a fixed grid, plus the
+                 number of failures (MOIC = 0, not drawable on a log axis)
+    - moic_ccdf: P(MOIC >= x) for positive MOIC, thinned to ~600 points
+    """
+    irr = results['IRR']
+    moic = results['MOIC']
+    path_label = results['Path']
+
+    # --- IRR Histogram ---
+    # Binned in float64: float32 edges overflow when IRR reaches the clip value
+    finite_irr = irr[np.isfinite(irr)].astype(np.float64)
+    irr_counts, irr_edges = np.histogram(finite_irr, bins=_IRR_HIST_BINS)
+
+    # --- MOIC Histogram by Path (log10 axis) ---
+    positive = moic > 0
+    zombie_counts, _ = np.histogram(
+        np.log10(moic[positive & (path_label == 1)]), bins=_MOIC_LOG10_EDGES
+    )
+    success_counts, _ = np.histogram(
+        np.log10(moic[positive & (path_label == 2)]), bins=_MOIC_LOG10_EDGES
+    )
+
+    # --- MOIC CCDF (log-log) ---
+    positive_moic = np.sort(moic[positive])
+    n = positive_moic.size
+    if n:
+        idx = np.arange(0, n, max(1, n // _CCDF_POINTS))
+        # Always include the tail
+        ccdf_x = np.append(positive_moic[idx], positive_moic[-1])
+        ccdf_y = np.append(1.0 - idx / n, 1.0 / n)
+    else:
+        ccdf_x = ccdf_y = np.empty(0)
+
+    return {
+        'irr_hist': {'counts': irr_counts, 'edges': irr_edges},
+        'moic_hist': {
+            'log10_edges': _MOIC_LOG10_EDGES,
+            'zombie': zombie_counts,
+            'success': success_counts,
+            'failure_count': int(np.count_nonzero(path_label == 0))
+        },
+        'moic_ccdf': {'x': ccdf_x, 'y': ccdf_y}
+    }
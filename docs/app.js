@@ -206,6 +206,9 @@ function formatMetrics(metrics) {
     for (const [key, value] of Object.entries(metrics)) {
         if (typeof value === 'string' && value === '') {
             out += `\n${key}\n`;
+        } else if (value === null) {
+            // The API sends non-finite numbers (e.g. infinite asymmetry) as null
+            out += `  ${key.padEnd(PAD)}: n/a (non-finite)\n`;
         } else if (typeof value === 'string') {
             out += `  ${key.padEnd(PAD)}: ${value}\n`;
         } else if (key.includes('IRR') || key.includes('P(')) {
@@ -268,12 +271,28 @@ function downloadChart(plotDiv, filename) {
         });
 }
 
+// The API sends pre-binned histograms ({counts, edges}) rather than raw
+// runs; turn them into bar-chart x (bin centres) and widths.
+function binCenters(edges) {
+    return edges.slice(0, -1).map((e, i) => (e + edges[i + 1]) / 2);
+}
+
+function binWidths(edges) {
+    return edges.slice(0, -1).map((e, i) => edges[i + 1] - e);
+}
+
+function normalize(counts) {
+    const total = counts.reduce((a, b) => a + b, 0);
+    return total > 0 ? counts.map(c => c / total) : counts;
+}
+
 // IRR histogram (single scenario, single trace)
-function renderIRRPlot(target, irrData) {
+function renderIRRPlot(target, irrHist) {
     const trace = {
-        x: irrData,
-        type: 'histogram',
-        nbinsx: 100,
+        x: binCenters(irrHist.edges),
+        y: irrHist.counts,
+        width: binWidths(irrHist.edges),
+        type: 'bar',
         name: 'IRR',
         marker: { color: '#007bff' }
     };
@@ -286,32 +305,32 @@ function renderIRRPlot(target, irrData) {
     Plotly.newPlot(target, [trace], layout, { responsive: true });
 }
 
-// MOIC histogram with 3 stacked path-conditional traces
-// (Failure / Zombie / Success on log10 axis)
-function renderMOICPlot(target, moicData, pathData) {
-    // Split MOIC by path, and only plot positive values (failures sit at 0)
-    const failureCount = moicData.filter((m, i) => pathData[i] === 0).length;
-    const zombieMoic   = moicData.filter((m, i) => pathData[i] === 1 && m > 0).map(Math.log10);
-    const successMoic  = moicData.filter((m, i) => pathData[i] === 2 && m > 0).map(Math.log10);
+// MOIC histogram with stacked path-conditional traces
+// (Zombie / Success on log10 axis; failures sit at 0 and are only counted)
+function renderMOICPlot(target, moicHist) {
+    const x = binCenters(moicHist.log10_edges);
+    const width = binWidths(moicHist.log10_edges);
+    const zombieCount  = moicHist.zombie.reduce((a, b) => a + b, 0);
+    const successCount = moicHist.success.reduce((a, b) => a + b, 0);
 
     const traces = [
         {
-            x: zombieMoic,
-            type: 'histogram',
-            nbinsx: 60,
-            name: `Zombie (${zombieMoic.length.toLocaleString()})`,
+            x: x,
+            y: moicHist.zombie,
+            width: width,
+            type: 'bar',
+            name: `Zombie (${zombieCount.toLocaleString()})`,
             marker: { color: '#f0ad4e' },
-            opacity: 0.75,
-            xbins: { start: -2, end: 4, size: 0.075 }
+            opacity: 0.75
         },
         {
-            x: successMoic,
-            type: 'histogram',
-            nbinsx: 60,
-            name: `Success (${successMoic.length.toLocaleString()})`,
+            x: x,
+            y: moicHist.success,
+            width: width,
+            type: 'bar',
+            name: `Success (${successCount.toLocaleString()})`,
             marker: { color: '#28a745' },
-            opacity: 0.75,
-            xbins: { start: -2, end: 4, size: 0.075 }
+            opacity: 0.75
         }
     ];
 
@@ -319,7 +338,7 @@ function renderMOICPlot(target, moicData, pathData) {
     const tickText = ['0.01x', '0.1x', '1x', '3x', '10x', '30x', '100x', '1,000x', '10,000x'];
 
     const layout = {
-        title: `MOIC Distribution by Path (${failureCount.toLocaleString()} failures at 0x not shown)`,
+        title: `MOIC Distribution by Path (${moicHist.failure_count.toLocaleString()} failures at 0x not shown)`,
         barmode: 'stack',
         xaxis: { title: 'MOIC (log scale)', tickvals: tickVals, ticktext: tickText },
         yaxis: { title: 'Frequency' },
@@ -339,29 +358,11 @@ function renderMOICPlot(target, moicData, pathData) {
 }
 
 // Empirical CCDF (1 - CDF) on log-log axes. Power-law tails appear linear.
-function computeCCDF(values) {
-    const positive = values.filter(v => v > 0).sort((a, b) => a - b);
-    const n = positive.length;
-    if (n === 0) return { x: [], y: [] };
-    // Sub-sample for plot speed (don't draw 100k points)
-    const step = Math.max(1, Math.floor(n / 600));
-    const xs = [];
-    const ys = [];
-    for (let i = 0; i < n; i += step) {
-        xs.push(positive[i]);
-        ys.push(1 - i / n);
-    }
-    // Always include the tail
-    xs.push(positive[n - 1]);
-    ys.push(1 / n);
-    return { x: xs, y: ys };
-}
-
-function renderCCDFPlot(target, moicData) {
-    const { x, y } = computeCCDF(moicData);
+// The points ({x, y}) are computed and thinned by the API.
+function renderCCDFPlot(target, ccdf) {
     const trace = {
-        x: x,
-        y: y,
+        x: ccdf.x,
+        y: ccdf.y,
         mode: 'lines',
         type: 'scatter',
         name: 'P(MOIC ≥ x)',
@@ -424,12 +425,12 @@ function renderTornadoPlot(target, baseline, results) {
 }
 
 // Render an A/B comparison: two histograms (IRR + MOIC) overlaid
-function renderCompareIRR(target, dataA, dataB) {
+function renderCompareIRR(target, histA, histB) {
     const traces = [
-        { x: dataA, type: 'histogram', nbinsx: 100, name: 'Scenario A',
-          marker: { color: '#007bff' }, opacity: 0.6, histnorm: 'probability' },
-        { x: dataB, type: 'histogram', nbinsx: 100, name: 'Scenario B',
-          marker: { color: '#dc3545' }, opacity: 0.6, histnorm: 'probability' }
+        { x: binCenters(histA.edges), y: normalize(histA.counts), width: binWidths(histA.edges),
+          type: 'bar', name: 'Scenario A', marker: { color: '#007bff' }, opacity: 0.6 },
+        { x: binCenters(histB.edges), y: normalize(histB.counts), width: binWidths(histB.edges),
+          type: 'bar', name: 'Scenario B', marker: { color: '#dc3545' }, opacity: 0.6 }
     ];
     const layout = {
         title: 'IRR Distribution — A vs B (normalized)',
@@ -441,16 +442,16 @@ function renderCompareIRR(target, dataA, dataB) {
     Plotly.newPlot(target, traces, layout, { responsive: true });
 }
 
-function renderCompareMOIC(target, dataA, dataB) {
-    const logA = dataA.filter(m => m > 0).map(Math.log10);
-    const logB = dataB.filter(m => m > 0).map(Math.log10);
+function renderCompareMOIC(target, histA, histB) {
+    // Zombie + Success = every positive-MOIC run on the shared log10 grid
+    const positiveCounts = h => h.zombie.map((c, i) => c + h.success[i]);
+    const x = binCenters(histA.log10_edges);
+    const width = binWidths(histA.log10_edges);
     const traces = [
-        { x: logA, type: 'histogram', nbinsx: 80, name: 'Scenario A',
-          marker: { color: '#007bff' }, opacity: 0.6, histnorm: 'probability',
-          xbins: { start: -2, end: 4, size: 0.075 } },
-        { x: logB, type: 'histogram', nbinsx: 80, name: 'Scenario B',
-          marker: { color: '#dc3545' }, opacity: 0.6, histnorm: 'probability',
-          xbins: { start: -2, end: 4, size: 0.075 } }
+        { x: x, y: normalize(positiveCounts(histA)), width: width, type: 'bar',
+          name: 'Scenario A', marker: { color: '#007bff' }, opacity: 0.6 },
+        { x: x, y: normalize(positiveCounts(histB)), width: width, type: 'bar',
+          name: 'Scenario B', marker: { color: '#dc3545' }, opacity: 0.6 }
     ];
     const tickVals = [-2, -1, 0, 0.477, 1, 1.477, 2, 3, 4];
     const tickText = ['0.01x', '0.1x', '1x', '3x', '10x', '30x', '100x', '1,000x', '10,000x'];
@@ -502,8 +503,8 @@ async function handleRunButton() {
 
         metricsOutput.textContent = formatMetrics(results.metrics);
         renderIRRPlot(irrPlotDiv, results.plot_data_irr);
-        renderMOICPlot(moicPlotDiv, results.plot_data_moic, results.plot_data_path || []);
-        renderCCDFPlot(ccdfPlotDiv, results.plot_data_moic);
+        renderMOICPlot(moicPlotDiv, results.plot_data_moic);
+        renderCCDFPlot(ccdfPlotDiv, results.plot_data_ccdf);
 
         document.getElementById('download-irr').style.display = 'inline-block';
         document.getElementById('download-moic').style.display = 'inline-block';